@@ -16,18 +16,26 @@ def parse_args():
     ap.add_argument("-p", "--port", default="/dev/ttyACM0", help="Serial port, e.g. /dev/ttyACM0 or COM3")
     ap.add_argument("-b", "--baud", type=int, default=921600, help="Baudrate, e.g. 921600/460800/115200")
     ap.add_argument("--print-interval", type=float, default=1, help="Seconds between prints in main thread")
-    ap.add_argument("--read-sleep", type=float, default=0.001, help="Background reader sleep to limit CPU")
+    ap.add_argument("--read-sleep", type=float, default=0.0, help="(legacy, unused) reader now blocks on serial read")
+    ap.add_argument("--read-chunk", type=int, default=0, help="Bytes per blocking read batch (default: ~4ms of line rate)")
     ap.add_argument("--stats-interval", type=float, default=1.0, help="Seconds between stats prints")
     return ap.parse_args()
 
+# 预绑定的输出模板：免去每次打印重新解析 f-string 的格式说明
+_FMT_RPY = "[{:.3f}] RID=0x03  roll={:.3f}  pitch={:.3f}  yaw={:.3f}\n".format
+_FMT_GEN = "[{:.3f}] RID=0x{:02X}  f1={:.3f}  f2={:.3f}  f3={:.3f}\n".format
+_FMT_STATS = "[stats] ok={} crc_fail={} short={} nohdr={} ok_rate={:.3f}\n".format
+
+_FLUSH_EVERY = 10  # 数据行每 N 条刷一次；统计行总是触发刷新（延迟上限 = 统计周期）
+
 def print_stats(dev: DM_Serial):
     total = dev.cnt_ok + dev.cnt_crc + dev.cnt_short + dev.cnt_nohdr
     ok_rate = (dev.cnt_ok / total) if total else 0.0
-    print(f"[stats] ok={dev.cnt_ok} crc_fail={dev.cnt_crc} short={dev.cnt_short} nohdr={dev.cnt_nohdr} ok_rate={ok_rate:.3f}", flush=True)
+    sys.stdout.write(_FMT_STATS(dev.cnt_ok, dev.cnt_crc, dev.cnt_short, dev.cnt_nohdr, ok_rate))
 
 def main():
     args = parse_args()
-    dev = DM_Serial(args.port, args.baud)
+    dev = DM_Serial(args.port, args.baud, read_chunk=args.read_chunk or None)
     if not dev.is_open:
         print(f"[error] cannot open serial: port={args.port} baud={args.baud}\n{dev.last_error()}", file=sys.stderr)
         sys.exit(1)
@@ -36,32 +44,43 @@ def main():
         print(f"[error] cannot start reader thread", file=sys.stderr)
         sys.exit(1)
 
-    next_print = time.time() + args.print_interval
-    next_stats = time.time() + args.stats_interval
+    next_print = time.monotonic() + args.print_interval
+    next_stats = time.monotonic() + args.stats_interval
     last_count = -1
+    unflushed = 0
+    out = sys.stdout
 
     try:
         while True:
-            now = time.time()
+            now = time.monotonic()  # 每轮只取一次时钟
 
             if now >= next_print:
                 pkt, ts, cnt = dev.get_latest()
                 if pkt is not None:
                     rid, (f1, f2, f3) = pkt
                     if rid == 0x03:
-                        print(f"[{ts:.3f}] RID=0x03  roll={f1:.3f}  pitch={f2:.3f}  yaw={f3:.3f}", flush=True)
+                        out.write(_FMT_RPY(ts, f1, f2, f3))
                     else:
-                        print(f"[{ts:.3f}] RID=0x{rid:02X}  f1={f1:.3f}  f2={f2:.3f}  f3={f3:.3f}", flush=True)
+                        out.write(_FMT_GEN(ts, rid, f1, f2, f3))
                     last_count = cnt
                 else:
-                    print("(no data yet)", flush=True)
+                    out.write("(no data yet)\n")
+                unflushed += 1
+                if unflushed >= _FLUSH_EVERY:
+                    out.flush()
+                    unflushed = 0
                 next_print = now + args.print_interval
 
             if now >= next_stats:
                 print_stats(dev)
+                out.flush()
+                unflushed = 0
                 next_stats = now + args.stats_interval
 
-            time.sleep(0.001)
+            # 事件驱动：有新帧或到达下一个打印/统计时刻才醒，替代 1kHz 轮询
+            timeout = min(next_print, next_stats) - time.monotonic()
+            if timeout > 0:
+                dev.wait_frame(timeout)
 
     except KeyboardInterrupt:
         pass
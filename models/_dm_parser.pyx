@@ -0,0 +1,142 @@
+# models/_dm_parser.pyx
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# -*- coding: utf-8 -*-
+"""
+可选的 C 加速帧解析器（Cython）。
+
+与 dm_serial._parse_all 的纯 Python 路径语义完全一致：
+扫描 0x55,0xAA 帧头 → 尾字节/RID/CRC 闸门 → 解出 3 个 float32(LE)。
+整个循环（含 CRC 表查找）都在 C 层完成，不经过字节码。
+
+构建：pip install cython && python setup.py build_ext --inplace
+未编译时 dm_serial 自动回退纯 Python 实现。
+
+注意：float 解码用 memcpy，假定宿主是小端（与帧内字节序一致）。
+"""
+from libc.string cimport memcpy
+
+cdef extern from *:
+    """
+    #include <stdint.h>
+    #include <string.h>
+
+    /* SWAR 帧头定位：一次装载 8 字节，零字节检测技巧
+       (v - 0x01..) & ~v & 0x80.. 找出所有 0x55 车道，无命中则整块跳过。
+       按字节车道操作 + memcpy 装载，对大小端和对齐都无假设。 */
+    static inline int64_t dm_find_hdr_swar(const unsigned char* buf,
+                                           int64_t n, int64_t start) {
+        static const uint64_t ones  = 0x0101010101010101ULL;
+        static const uint64_t highs = 0x8080808080808080ULL;
+        static const uint64_t sofs  = 0x5555555555555555ULL;
+        int64_t i = start;
+        while (i + 8 <= n) {
+            uint64_t v;
+            memcpy(&v, buf + i, 8);
+            uint64_t x = v ^ sofs;              /* 0x55 字节变为 0x00 */
+            if ((x - ones) & ~x & highs) {
+                /* 块内有 0x55 候选：标量精确定位（头对可跨块，界内验证） */
+                int64_t lim = (i + 8 < n) ? i + 8 : n - 1;
+                for (; i < lim; i++) {
+                    if (buf[i] == 0x55 && buf[i + 1] == 0xAA)
+                        return i;
+                }
+            } else {
+                i += 8;
+            }
+        }
+        for (; i + 1 < n; i++) {
+            if (buf[i] == 0x55 && buf[i + 1] == 0xAA)
+                return i;
+        }
+        return -1;
+    }
+    """
+    long long dm_find_hdr_swar(const unsigned char* buf, long long n, long long start) nogil
+
+DEF FRAME_LEN = 19
+
+# RID 合法集 {0x01,0x02,0x03} 的位图；与 dm_serial.VALID_RIDS 保持同步
+DEF RID_MASK = 0x0E
+
+# CRC16 表（多项式 0x1021，初值 0xFFFF），与 dm_crc.CRC16_TABLE 同一份数据
+cdef unsigned short _CRC_TBL[256]
+
+def _load_crc_table():
+    from .dm_crc import CRC16_TABLE
+    cdef int i
+    for i in range(256):
+        _CRC_TBL[i] = CRC16_TABLE[i]
+
+_load_crc_table()
+
+cdef inline unsigned short _crc16(const unsigned char* p, Py_ssize_t n) nogil:
+    # 与 dm_crc._dm_crc16_py 逐位一致（注意是 crc<<1 的固件变体）
+    cdef unsigned short crc = 0xFFFF
+    cdef Py_ssize_t i
+    cdef unsigned char idx
+    for i in range(n):
+        idx = ((crc >> 8) ^ p[i]) & 0xFF
+        crc = ((crc << 1) ^ _CRC_TBL[idx]) & 0xFFFF
+    return crc
+
+cdef inline Py_ssize_t _find_hdr(const unsigned char* buf, Py_ssize_t n, Py_ssize_t start) nogil:
+    return <Py_ssize_t>dm_find_hdr_swar(buf, n, start)
+
+def parse_frames(const unsigned char[:] data, bint skip_hdr):
+    """解析 data 中所有完整帧。
+
+    返回 (results, consumed, cnt_crc, cnt_short, cnt_nohdr)：
+    results 为 [(rid, (f1, f2, f3)), ...]，consumed 为可安全丢弃的前缀长度，
+    其余为各类拒收帧计数——调用方累加到自己的统计并压缩缓冲。
+    """
+    cdef Py_ssize_t n = data.shape[0]
+    cdef const unsigned char* buf = NULL
+    cdef Py_ssize_t start = 0, j, consumed = 0
+    cdef int cnt_crc = 0, cnt_short = 0, cnt_nohdr = 0
+    cdef unsigned short crc_calc, crc_wire
+    cdef unsigned char rid
+    cdef float f[3]
+    results = []
+
+    if n > 0:
+        buf = &data[0]
+
+    while True:
+        j = _find_hdr(buf, n, start)
+        if j < 0:
+            if start < n:
+                # 未消费区间里没有帧头：只保留最后 1 个字节
+                consumed = n - 1
+                cnt_nohdr += 1
+            else:
+                consumed = n
+            break
+
+        if n - j < FRAME_LEN:
+            consumed = j
+            cnt_short += 1
+            break
+
+        start = j + 1
+
+        if buf[j + FRAME_LEN - 1] != 0x0A:
+            continue
+        rid = buf[j + 3]
+        if rid > 31 or not ((RID_MASK >> rid) & 1):
+            continue
+
+        if skip_hdr:
+            crc_calc = _crc16(buf + j + 2, 14)
+        else:
+            crc_calc = _crc16(buf + j, 16)
+        crc_wire = buf[j + 16] | (buf[j + 17] << 8)
+        if crc_calc != crc_wire:
+            cnt_crc += 1
+            continue
+
+        memcpy(f, buf + j + 4, 12)
+        results.append((rid, (f[0], f[1], f[2])))
+        consumed = j + FRAME_LEN
+        start = consumed
+
+    return results, consumed, cnt_crc, cnt_short, cnt_nohdr
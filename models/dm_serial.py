@@ -2,18 +2,26 @@
 # -*- coding: utf-8 -*-
 """
 DM_Serial: 达妙 IMU 串口读取类（支持“后台读线程” + 主线程按需取最新）
-- 固定 timeout=0（非阻塞）
-- read(): Drain+ParseAll+Latest（也可单线程调用）
+- 串口 timeout 按波特率推导（读满约 4ms 一批即返回），后台线程阻塞读、无轮询小睡
+- read(): Drain+ParseAll+Latest（只取 in_waiting，仍是非阻塞，可单线程调用）
 - start_reader()/stop_reader(): 在内部起一个只负责“刷新数据”的线程，不打印
 - get_latest(): 主线程随时取“最新一帧”与其时间戳/计数
 - destory()/reopen(): 资源管理
-- CRC：默认“包含帧头 0x55,0xAA”，失败自动再试“不含帧头”
+- CRC：按 SKIP_HDR_IN_CRC 选择“包含/不含帧头 0x55,0xAA”计算一次
 
 帧格式：
 [0,1]=0x55,0xAA | [2]=? | [3]=RID | [4:16]=3*float32(LE) | [16:18]=CRC16(LE) | [18]=0x0A
+
+I/O 路径说明：后台线程对串口做阻塞批量读（≤5ms 超时），积压时经
+os.readv 一次系统调用落入预分配暂存区——每批一次 syscall。曾评估过
+io_uring（multishot read + SQPOLL，零 syscall 摄取），但对 ≤100KB/s 的
+单 TTY 来说收益在噪声以下，还要引入 Linux-only 依赖并放弃 Windows
+兼容，故不采用；若未来要在一个环上聚合多路传感器再考虑。
 """
 from __future__ import annotations
 
+import array
+import os
 import struct
 import threading
 import time
@@ -23,21 +31,57 @@ import serial  # pip install pyserial
 
 from .dm_crc import dm_crc16
 
+try:
+    # 可选的 Cython 加速解析器（python setup.py build_ext --inplace）
+    from ._dm_parser import parse_frames as _parse_frames_c
+except ImportError:
+    _parse_frames_c = None
+
+try:
+    # 可选：没有 C 解析器时，大批量积压走 NumPy 向量化解码
+    import numpy as _np
+except ImportError:
+    _np = None
+
 HDR = b'\x55\xAA'
 TAIL = 0x0A
 FRAME_LEN = 19
-VALID_RIDS = {0x01, 0x02, 0x03}
+VALID_RIDS = frozenset({0x01, 0x02, 0x03})
+
+# VALID_RIDS 的位图形式：热路径上一次移位+与 替代小整数哈希查找
+_RID_MASK = 0
+for _rid in VALID_RIDS:
+    _RID_MASK |= 1 << _rid
+del _rid
+
+# 预编译的帧字段格式（避免每帧重新解析格式串、少两次 Python 调用）
+_FRAME3F = struct.Struct('<fff')   # [4:16] 3*float32(LE)
+_CRC_LE = struct.Struct('<H')      # [16:18] CRC16(LE)
+
+# 积压达到多少字节才值得走 NumPy 批量路径（约 8 帧时摊销过界）
+_NP_BATCH_MIN = 8 * FRAME_LEN
 
 # 你的固件：CRC 计算应包含帧头，如需兼容其它版本可切换；我们也做了兜底。
 SKIP_HDR_IN_CRC = False
 
 class DM_Serial:
-    def __init__(self, port: str, baudrate: int):
+    def __init__(self, port: str, baudrate: int, read_chunk: Optional[int] = None):
         self.port = port
         self.baudrate = int(baudrate)
-        self.timeout = 0.0  # 非阻塞
+        # 一批阻塞读的目标字节数按线速推导：8N1 下每字节 10 bit，
+        # 取约 4ms 的数据量（921600 波特 ≈ 368 字节 ≈ 19 帧），
+        # 在延迟上界与每次 read 开销之间取平衡；可用 read_chunk 覆盖。
+        byte_rate = max(1, self.baudrate // 10)
+        self._read_chunk = int(read_chunk) if read_chunk else max(FRAME_LEN, int(byte_rate * 0.004))
+        # 串口超时 = 读满一批所需时间：阻塞读“读满即返、最迟一批”；
+        # read() 仍只取 in_waiting，保持非阻塞
+        self.timeout = self._read_chunk / byte_rate
         self.ser: Optional[serial.Serial] = None
+        self._fd: Optional[int] = None  # POSIX 裸 fd，os.read 快路径；不可用时为 None
         self._buf = bytearray()
+        # 预分配的读暂存区：免去每次读都新分配一个 bytes
+        self._scratch = bytearray(8192)
+        self._scratch_mv = memoryview(self._scratch)
 
         # 统计
         self.cnt_ok = 0
@@ -48,13 +92,22 @@ class DM_Serial:
         # 后台读线程状态
         self._th: Optional[threading.Thread] = None
         self._stop_evt: Optional[threading.Event] = None
-        self._read_sleep = 0.001  # 读线程小睡控制 CPU
-
-        # 最新数据（线程安全）
-        self._latest_lock = threading.Lock()
-        self._latest_pkt: Optional[Tuple[int, Tuple[float, float, float]]] = None
-        self._latest_ts: float = 0.0
-        self._latest_count: int = 0
+        self._read_sleep = 0.0  # 兼容保留：阻塞读本身限速，不再需要小睡
+
+        # 最新数据：SoA（列式）环形缓冲，单生产者/单消费者、无锁。
+        # 读线程把每帧写进平行的 array.array（C 级标量存储，发布端零元组分配），
+        # 消费端只在 get_latest() 边界组装一次 Python 元组。
+        # GIL 保证各标量存取原子；_head 最后写、_latest_count 再其后，
+        # 消费端按 count→head→字段 的顺序读，最多读到比 count 更新的帧（无害）。
+        self._ring_cap = 1024  # 2 的幂
+        self._ring_rid = array.array('B', bytes(self._ring_cap))
+        self._ring_f1 = array.array('f', [0.0] * self._ring_cap)
+        self._ring_f2 = array.array('f', [0.0] * self._ring_cap)
+        self._ring_f3 = array.array('f', [0.0] * self._ring_cap)
+        self._ring_ts = array.array('d', [0.0] * self._ring_cap)
+        self._head = 0
+        self._latest_count: int = 0  # 仅读线程递增
+        self._new_frame = threading.Event()  # 有新帧发布时置位，供消费端阻塞等待
         self._last_error: Optional[str] = None
 
         self._open()
@@ -68,8 +121,12 @@ class DM_Serial:
         frames = self._parse_all()
         return frames[-1] if frames else None
 
-    def start_reader(self, read_sleep: float = 0.001) -> bool:
-        """启动只负责刷新数据的后台线程；不打印。"""
+    def start_reader(self, read_sleep: float = 0.0) -> bool:
+        """启动只负责刷新数据的后台线程；不打印。
+
+        read_sleep 仅为兼容旧调用保留：后台线程现在做阻塞读
+        （读满 _read_chunk 或超时即醒），不再按固定周期小睡。
+        """
         if self._th and self._th.is_alive():
             self._read_sleep = read_sleep
             return True
@@ -92,9 +149,24 @@ class DM_Serial:
         self._stop_evt = None
 
     def get_latest(self) -> Tuple[Optional[Tuple[int, Tuple[float, float, float]]], float, int]:
-        """线程安全地获取（pkt, timestamp, count）。"""
-        with self._latest_lock:
-            return self._latest_pkt, self._latest_ts, self._latest_count
+        """线程安全地获取（pkt, timestamp, count）；count 可用于判断有没有新帧。"""
+        count = self._latest_count
+        if count == 0:
+            return None, 0.0, 0
+        idx = self._head
+        pkt = (self._ring_rid[idx],
+               (self._ring_f1[idx], self._ring_f2[idx], self._ring_f3[idx]))
+        return pkt, self._ring_ts[idx], count
+
+    def wait_frame(self, timeout: Optional[float] = None) -> bool:
+        """阻塞等待后台线程发布新帧；返回是否等到（超时返回 False）。
+
+        让消费端事件驱动地醒来，替代固定周期轮询 get_latest()。
+        """
+        got = self._new_frame.wait(timeout)
+        if got:
+            self._new_frame.clear()
+        return got
 
     def last_error(self) -> Optional[str]:
         return self._last_error
@@ -107,6 +179,7 @@ class DM_Serial:
                 self.ser.close()
             finally:
                 self.ser = None
+                self._fd = None
 
     # 别名
     def destroy(self) -> None:
@@ -129,96 +202,254 @@ class DM_Serial:
                 self.ser.reset_input_buffer()
             except Exception:
                 pass
+            # 已知长度的读直接走 os.read，绕过 pySerial 每次调用的超时簿记；
+            # Windows / 虚拟串口没有可用 fd，保持 None 走 ser.read 兜底。
+            try:
+                self._fd = self.ser.fileno() if os.name == 'posix' else None
+            except Exception:
+                self._fd = None
             return True
         except Exception as e:
             self._last_error = str(e)
             self.ser = None
+            self._fd = None
             return False
 
     def _reader_loop(self):
         """后台线程：不断刷新最新数据，不打印。"""
         evt = self._stop_evt
         try:
-            while evt and not evt.is_set():
-                pkt = self.read(None)
-                if pkt is not None:
-                    with self._latest_lock:
-                        self._latest_pkt = pkt
-                        self._latest_ts = time.time()
-                        self._latest_count += 1
-                if self._read_sleep > 0.0:
-                    time.sleep(self._read_sleep)
+            # 把循环内不变的属性提升为局部变量，省掉每轮的 LOAD_ATTR。
+            # 这些引用在对象生命周期内稳定；reopen() 只换 self.ser，
+            # 而 _read_blocking 每次都重新取 self.ser，不受提升影响。
+            mask = self._ring_cap - 1
+            ring_rid = self._ring_rid
+            ring_f1 = self._ring_f1
+            ring_f2 = self._ring_f2
+            ring_f3 = self._ring_f3
+            ring_ts = self._ring_ts
+            read_blocking = self._read_blocking
+            notify = self._new_frame.set
+            stopped = evt.is_set
+            now = time.time
+            while not stopped():
+                frames = read_blocking()
+                if frames:
+                    ts = now()
+                    idx = self._head
+                    for rid, (f1, f2, f3) in frames:
+                        idx = (idx + 1) & mask
+                        ring_rid[idx] = rid
+                        ring_f1[idx] = f1
+                        ring_f2[idx] = f2
+                        ring_f3[idx] = f3
+                        ring_ts[idx] = ts
+                    self._head = idx  # 字段就位后才发布下标
+                    self._latest_count += len(frames)
+                    notify()
         except Exception as e:
             # 不打印，记录错误字符串，便于主线程查询
             self._last_error = f"reader_loop: {e!r}"
 
+    def _read_blocking(self) -> List[Tuple[int, Tuple[float, float, float]]]:
+        """后台线程用的批量读：积压够多立即取走，否则阻塞等一批（≤timeout）。"""
+        ser = self.ser
+        if not ser or not ser.is_open:
+            return []
+        n = ser.in_waiting
+        if n >= FRAME_LEN:
+            # 快路径：已有完整帧，立即全部取走，不等待
+            self._read_into_buf(None)
+        else:
+            # 阻塞至读满一批或超时；由内核唤醒，无调度小睡的抖动
+            chunk = ser.read(self._read_chunk)
+            if not chunk:
+                return []
+            self._buf.extend(chunk)
+        return self._parse_all()
+
     def _read_into_buf(self, max_bytes: Optional[int]) -> int:
         """把串口里“当前可读”的字节读入缓冲；返回读取字节数。"""
         n = getattr(self.ser, "in_waiting", 0) if self.ser else 0
         if max_bytes is not None and n > max_bytes:
             n = max_bytes
-        if n <= 0:
-            return 0
-        self._buf.extend(self.ser.read(n))
-        return n
+        total = 0
+        while n > 0:
+            got = self._drain_ready(n)
+            if got <= 0:
+                break
+            total += got
+            n -= got
+        return total
+
+    def _drain_ready(self, n: int) -> int:
+        """把最多 n 个已就绪字节读进 self._buf（经预分配暂存区，零新分配）。"""
+        if n > len(self._scratch):
+            n = len(self._scratch)
+        view = self._scratch_mv[:n]
+        fd = self._fd
+        if fd is not None:
+            try:
+                # POSIX：一次 readv 系统调用直接落到暂存区
+                got = os.readv(fd, [view])
+            except BlockingIOError:
+                return 0
+        else:
+            got = self.ser.readinto(view) or 0
+        if got > 0:
+            self._buf += self._scratch_mv[:got]
+        return got
 
     def _parse_all(self) -> List[Tuple[int, Tuple[float, float, float]]]:
         """解析尽可能多的完整帧，返回列表。"""
+        if _parse_frames_c is not None:
+            results, consumed, n_crc, n_short, n_nohdr = _parse_frames_c(
+                self._buf, SKIP_HDR_IN_CRC)
+            if consumed:
+                del self._buf[:consumed]
+            self.cnt_ok += len(results)
+            self.cnt_crc += n_crc
+            self.cnt_short += n_short
+            self.cnt_nohdr += n_nohdr
+            return results
+
+        if _np is not None and len(self._buf) >= _NP_BATCH_MIN:
+            return self._parse_all_np()
+
         results: List[Tuple[int, Tuple[float, float, float]]] = []
         buf = self._buf
+        n = len(buf)
+        mv = memoryview(buf)
         start = 0
+        consumed = 0  # 已消费的字节数；退出时一次性压缩缓冲
 
         while True:
             j = buf.find(HDR, start)
             if j < 0:
-                # 只保留最后 1 个字节，避免帧头跨包
-                keep = buf[-1:] if buf else b''
-                self._buf = bytearray(keep)
-                if buf:
+                if start < n:
+                    # 未消费区间里没有帧头：只保留最后 1 个字节，避免帧头跨包
+                    consumed = n - 1
                     self.cnt_nohdr += 1
+                else:
+                    consumed = n
                 break
 
-            if len(buf) - j < FRAME_LEN:
+            if n - j < FRAME_LEN:
                 # 不够一帧，保留从帧头开始的尾部
-                self._buf = bytearray(buf[j:])
+                consumed = j
                 self.cnt_short += 1
                 break
 
-            frame = bytes(buf[j:j + FRAME_LEN])
             start = j + 1  # 快速向前移动
 
-            # 尾字节检查
-            if frame[-1] != TAIL:
+            # 尾字节检查（直接下标，不复制整帧）
+            if buf[j + FRAME_LEN - 1] != TAIL:
                 continue
 
-            rid = frame[3]
-            if rid not in VALID_RIDS:
+            rid = buf[j + 3]
+            if not (_RID_MASK >> rid) & 1:
                 continue
 
-            # CRC（默认含帧头，失败再试不含帧头）
+            # CRC 最后做（最贵的校验放在廉价的尾字节/RID 闸门之后）
             if SKIP_HDR_IN_CRC:
-                crc_calc = dm_crc16(frame[2:16])
+                crc_calc = dm_crc16(mv[j + 2:j + 16])
             else:
-                crc_calc = dm_crc16(frame[0:16])
-            crc_wire = frame[16] | (frame[17] << 8)
+                crc_calc = dm_crc16(mv[j:j + 16])
+            crc_wire, = _CRC_LE.unpack_from(buf, j + 16)
             if crc_calc != crc_wire:
-                alt = dm_crc16(frame[2:16]) if not SKIP_HDR_IN_CRC else dm_crc16(frame[0:16])
-                if alt != crc_wire:
-                    self.cnt_crc += 1
-                    continue
+                self.cnt_crc += 1
+                continue
 
-            # 解 3 个 float32（LE）
-            f1 = struct.unpack('<f', frame[4:8])[0]
-            f2 = struct.unpack('<f', frame[8:12])[0]
-            f3 = struct.unpack('<f', frame[12:16])[0]
+            # 解 3 个 float32（LE），一次 C 调用直接从缓冲取
+            f1, f2, f3 = _FRAME3F.unpack_from(buf, j + 4)
             results.append((rid, (f1, f2, f3)))
 
-            # 丢弃已消费的数据（到帧尾），并从头继续找
-            buf = buf[j + FRAME_LEN:]
-            start = 0
+            # 仅推进游标；压缩延迟到循环结束统一做一次
+            consumed = j + FRAME_LEN
+            start = consumed
+
+        mv.release()
+        if consumed:
+            # bytearray 的 del 是 O(n)，但每次调用只做一次，而非每帧一次。
+            # 压缩后的残留要么以帧头开头（短帧），要么只剩 1 字节（无帧头），
+            # 下次调用从 0 开始 find 不会重复扫描任何已排除的前缀，
+            # 因此无需跨调用保存扫描游标。
+            del buf[:consumed]
+
+        self.cnt_ok += len(results)
+        return results
+
+    def _parse_all_np(self) -> List[Tuple[int, Tuple[float, float, float]]]:
+        """NumPy 批量解析：一次定位所有帧头候选，闸门校验向量化，浮点批量解码。
+
+        与逐帧循环语义逐字节一致（贪心接收、拒收不消费、同一套计数与残留规则），
+        只有 CRC 仍逐候选做——向量化 CRC 留待后续。
+        """
+        buf = self._buf
+        n = len(buf)
+        a = _np.frombuffer(buf, dtype=_np.uint8)
 
-        if isinstance(buf, (bytes, bytearray)) and buf is not self._buf:
-            self._buf = bytearray(buf)
+        # 所有 0x55,0xAA 候选位置
+        cands = _np.flatnonzero((a[:-1] == 0x55) & (a[1:] == 0xAA))
 
+        results: List[Tuple[int, Tuple[float, float, float]]] = []
+        accepted: List[int] = []
+        rids: List[int] = []
+        pos = 0            # 接收游标：只有接收才前移
+        consumed = -1      # <0 表示循环自然跑完（走无帧头收尾）
+        short = False
+
+        if len(cands):
+            full = cands <= n - FRAME_LEN
+            # 全帧候选的尾字节/RID 闸门一次算完
+            tail_ok = _np.zeros(len(cands), dtype=bool)
+            rid_ok = _np.zeros(len(cands), dtype=bool)
+            fc = cands[full]
+            tail_ok[full] = a[fc + FRAME_LEN - 1] == TAIL
+            rid_vals = a[fc + 3]
+            rid_ok[full] = _np.isin(rid_vals, list(VALID_RIDS))
+
+            mv = memoryview(buf)
+            for k in range(len(cands)):
+                j = int(cands[k])
+                if j < pos:
+                    continue
+                if not full[k]:
+                    consumed = j
+                    self.cnt_short += 1
+                    short = True
+                    break
+                if not (tail_ok[k] and rid_ok[k]):
+                    continue
+                if SKIP_HDR_IN_CRC:
+                    crc_calc = dm_crc16(mv[j + 2:j + 16])
+                else:
+                    crc_calc = dm_crc16(mv[j:j + 16])
+                if crc_calc != (buf[j + 16] | (buf[j + 17] << 8)):
+                    self.cnt_crc += 1
+                    continue
+                accepted.append(j)
+                rids.append(buf[j + 3])
+                pos = j + FRAME_LEN
+            mv.release()
+
+        if not short:
+            if pos < n:
+                consumed = n - 1 if n else 0
+                if n:
+                    self.cnt_nohdr += 1
+            else:
+                consumed = n
+
+        if accepted:
+            # (k,12) 字节聚合后整体 view 成 (k,3) float32——解码一次完成
+            idx = _np.asarray(accepted)[:, None] + _np.arange(4, 16)
+            floats = a[idx].view('<f4')
+            for rid, row in zip(rids, floats):
+                results.append((rid, (float(row[0]), float(row[1]), float(row[2]))))
+
+        a = None  # 释放对 buf 的缓冲导出，否则 del 会抛 BufferError
+        if consumed > 0:
+            del buf[:consumed]
         self.cnt_ok += len(results)
         return results
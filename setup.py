@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+可选的 C 扩展构建脚本：把 models/_dm_parser.pyx 编译成加速解析器。
+  pip install cython
+  python setup.py build_ext --inplace
+没有 Cython 时照常安装，运行时自动回退纯 Python 解析。
+"""
+from setuptools import setup, Extension
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("models._dm_parser", ["models/_dm_parser.pyx"])],
+        language_level=3,
+    )
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="dm-imu",
+    version="0.1.0",
+    description="达妙 IMU 串口读取",
+    packages=["models"],
+    install_requires=["pyserial"],
+    ext_modules=ext_modules,
+)